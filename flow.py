@@ -1,10 +1,14 @@
 from typing import List, Dict, Any, Tuple
+import os
 import yaml
 import logging
 from pocketflow import Node, BatchNode, Flow
 from utils.call_llm import call_llm
+from utils.prompts import build_topics_prompt, build_content_prompt, MAX_TOPICS
 from utils.media_processor import MediaProcessor
 from utils.markdown_generator import generate_markdown
+from utils.source_key import canonical_source_key, key_slug
+from utils.single_flight import SingleFlight
 
 # Set up logging
 logging.basicConfig(
@@ -18,16 +22,17 @@ logger = logging.getLogger(__name__)
 class ProcessMediaSource(Node):
     """Process input source (YouTube URL or local file)"""
     def prep(self, shared):
-        """Get source from shared"""
-        return shared.get("source", "")
+        """Get source and optional transcript cache directory from shared"""
+        return shared.get("source", ""), shared.get("cache_dir")
     
-    def exec(self, source):
+    def exec(self, prep_res):
         """Process media source"""
+        source, cache_dir = prep_res
         if not source:
             raise ValueError("No source provided")
         
         logger.info(f"Processing source: {source}")
-        processor = MediaProcessor()
+        processor = MediaProcessor(cache_dir=cache_dir)
         source_info = processor.process_source(source)
         
         return source_info
@@ -43,10 +48,10 @@ class ProcessMediaSource(Node):
 class ExtractTopicsAndQuestions(Node):
     """Extract interesting topics and generate questions from the video transcript"""
     def prep(self, shared):
-        """Get transcript and title from video_info"""
-        video_info = shared.get("video_info", {})
-        transcript = video_info.get("transcript", "")
-        title = video_info.get("title", "")
+        """Get transcript and title from source_info"""
+        source_info = shared.get("source_info", {})
+        transcript = source_info.get("transcript", "")
+        title = source_info.get("title", "")
         return {"transcript": transcript, "title": title}
     
     def exec(self, data):
@@ -55,32 +60,7 @@ class ExtractTopicsAndQuestions(Node):
         title = data["title"]
         
         # Single prompt to extract topics and questions together
-        prompt = f"""
-You are an expert content analyzer. Given a YouTube video transcript, identify at most 5 most interesting topics discussed and generate at most 3 most thought-provoking questions for each topic.
-These questions don't need to be directly asked in the video. It's good to have clarification questions.
-
-VIDEO TITLE: {title}
-
-TRANSCRIPT:
-{transcript}
-
-Format your response in YAML:
-
-```yaml
-topics:
-  - title: |
-        First Topic Title
-    questions:
-      - |
-        Question 1 about first topic?
-      - |
-        Question 2 ...
-  - title: |
-        Second Topic Title
-    questions:
-        ...
-```
-        """
+        prompt = build_topics_prompt(title, transcript)
         
         response = call_llm(prompt)
         
@@ -92,7 +72,7 @@ topics:
         raw_topics = parsed.get("topics", [])
         
         # Ensure we have at most 5 topics
-        raw_topics = raw_topics[:5]
+        raw_topics = raw_topics[:MAX_TOPICS]
         
         # Format the topics and questions for our data structure
         result_topics = []
@@ -130,8 +110,8 @@ class ProcessContent(BatchNode):
     def prep(self, shared):
         """Return list of topics for batch processing"""
         topics = shared.get("topics", [])
-        video_info = shared.get("video_info", {})
-        transcript = video_info.get("transcript", "")
+        source_info = shared.get("source_info", {})
+        transcript = source_info.get("transcript", "")
         
         batch_items = []
         for topic in topics:
@@ -150,42 +130,7 @@ class ProcessContent(BatchNode):
         topic_title = topic["title"]
         questions = [q["original"] for q in topic["questions"]]
         
-        prompt = f"""You are a content simplifier for children. Given a topic and questions from a YouTube video, rephrase the topic title and questions to be clearer, and provide simple ELI5 (Explain Like I'm 5) answers.
-
-TOPIC: {topic_title}
-
-QUESTIONS:
-{chr(10).join([f"- {q}" for q in questions])}
-
-TRANSCRIPT EXCERPT:
-{transcript}
-
-For topic title and questions:
-1. Keep them catchy and interesting, but short
-
-For your answers:
-1. Format them using HTML with <b> and <i> tags for highlighting. 
-2. Prefer lists with <ol> and <li> tags. Ideally, <li> followed by <b> for the key points.
-3. Quote important keywords but explain them in easy-to-understand language (e.g., "<b>Quantum computing</b> is like having a super-fast magical calculator")
-4. Keep answers interesting but short
-
-Format your response in YAML:
-
-```yaml
-rephrased_title: |
-    Interesting topic title in 10 words
-questions:
-  - original: |
-        {questions[0] if len(questions) > 0 else ''}
-    rephrased: |
-        Interesting question in 15 words
-    answer: |
-        Simple answer that a 5-year-old could understand in 100 words
-  - original: |
-        {questions[1] if len(questions) > 1 else ''}
-    ...
-```
-        """
+        prompt = build_content_prompt(topic_title, questions, transcript)
         
         response = call_llm(prompt)
         
@@ -244,6 +189,31 @@ questions:
         logger.info(f"Processed content for {len(exec_res_list)} topics")
         return "default"
 
+class StoreResults(Node):
+    """Persist source info and processed topics, if a store directory is set"""
+    def prep(self, shared):
+        """Get store directory, source info and topics from shared"""
+        return {
+            "store_dir": shared.get("store_dir"),
+            "source_info": shared.get("source_info", {}),
+            "topics": shared.get("topics", [])
+        }
+    
+    def exec(self, data):
+        """Save a versioned record that render.py can re-render from"""
+        if not data["store_dir"]:
+            return None
+        from utils.result_store import save_record
+
+        return save_record(data["store_dir"], data["source_info"], data["topics"])
+    
+    def post(self, shared, prep_res, exec_res):
+        """Store the record path in shared"""
+        if exec_res:
+            shared["result_path"] = exec_res
+            logger.info(f"Stored results to {exec_res}")
+        return "default"
+
 class GenerateMarkdown(Node):
     """Generate Markdown output from processed content"""
     def prep(self, shared):
@@ -270,25 +240,166 @@ class GenerateMarkdown(Node):
         shared["markdown_output"] = exec_res
         
         # Write Markdown to file
-        with open("output.md", "w") as f:
+        output_path = shared.get("output_path", "output.md")
+        with open(output_path, "w") as f:
             f.write(exec_res)
         
-        logger.info("Generated Markdown output and saved to output.md")
+        logger.info(f"Generated Markdown output and saved to {output_path}")
+        return "default"
+
+class GenerateHTML(Node):
+    """Publish the HTML report into the static site, if a site directory is set"""
+    def prep(self, shared):
+        """Get site directory, source info and topics from shared"""
+        return {
+            "site_dir": shared.get("site_dir"),
+            # run_batch rewrites the index once at the end instead of per video
+            "write_index": shared.get("flush_site_index", True),
+            "source_info": shared.get("source_info", {}),
+            "topics": shared.get("topics", [])
+        }
+    
+    def exec(self, data):
+        """Write the report and update the site index"""
+        if not data["site_dir"]:
+            return None
+        from utils.site_index import get_site_index
+
+        return get_site_index(data["site_dir"]).publish(
+            data["source_info"], data["topics"], write_index=data["write_index"]
+        )
+    
+    def post(self, shared, prep_res, exec_res):
+        """Store the report path in shared"""
+        if exec_res:
+            shared["html_output_path"] = exec_res
+            logger.info(f"Published HTML report to {exec_res}")
+        return "default"
+
+class UpdateSearchIndex(Node):
+    """Add the processed video to the full-text search index, if one is set"""
+    def prep(self, shared):
+        """Get index path, source info and topics from shared"""
+        return {
+            "index_path": shared.get("index_path"),
+            "source_info": shared.get("source_info", {}),
+            "topics": shared.get("topics", [])
+        }
+    
+    def exec(self, data):
+        """Index topics, questions, answers and transcript chunks"""
+        if not data["index_path"]:
+            return None
+        from utils.search_index import get_search_index
+
+        return get_search_index(data["index_path"]).index_video(data["source_info"], data["topics"])
+    
+    def post(self, shared, prep_res, exec_res):
+        """Log whether the index changed"""
+        if exec_res is not None:
+            logger.info(f"Search index {'updated' if exec_res else 'already up to date'}: {prep_res['index_path']}")
         return "default"
 
 # Create the flow
-def create_youtube_processor_flow():
-    """Create and connect the nodes for the YouTube processor flow"""
-    # Create nodes
+def create_analysis_flow():
+    """Create the nodes that fetch a source and analyze it with the LLM"""
     process_url = ProcessMediaSource(max_retries=2, wait=10)
     extract_topics_and_questions = ExtractTopicsAndQuestions(max_retries=2, wait=10)
     process_content = ProcessContent(max_retries=2, wait=10)
-    generate_html = GenerateMarkdown(max_retries=2, wait=10)
-    
-    # Connect nodes
-    process_url >> extract_topics_and_questions >> process_content >> generate_html
-    
-    # Create flow
-    flow = Flow(start=process_url)
-    
-    return flow
+
+    process_url >> extract_topics_and_questions >> process_content
+
+    return Flow(start=process_url)
+
+def create_output_flow():
+    """Create the nodes that store and publish an analyzed source"""
+    store_results = StoreResults(max_retries=2, wait=10)
+    generate_markdown = GenerateMarkdown(max_retries=2, wait=10)
+    generate_html = GenerateHTML(max_retries=2, wait=10)
+    update_search_index = UpdateSearchIndex(max_retries=2, wait=10)
+
+    store_results >> generate_markdown >> generate_html >> update_search_index
+
+    return Flow(start=store_results)
+
+def create_youtube_processor_flow():
+    """Create and connect the nodes for the YouTube processor flow"""
+    # Analysis, then outputs
+    analysis = create_analysis_flow()
+    analysis >> create_output_flow()
+
+    return Flow(start=analysis)
+
+# Concurrent runs for the same video share one analysis
+_inflight_analyses = SingleFlight()
+
+def _analyze(source, cache_dir):
+    shared = {"source": source, "cache_dir": cache_dir}
+    create_analysis_flow().run(shared)
+    return shared["source_info"], shared["topics"]
+
+def run_youtube_processor(source, output_path="output.md", **options):
+    """Run the flow for one source and return the shared store
+
+    Extra options (cache_dir, store_dir, site_dir, index_path) are passed to the nodes through the
+    shared store. Callers that ask for the same video (in any URL form) or the
+    same file contents while an analysis is in flight wait for it instead of
+    starting their own transcript fetch and LLM calls; each caller then writes
+    its own outputs.
+    """
+    key = canonical_source_key(source)
+    source_info, topics = _inflight_analyses.do(key, _analyze, source, options.get("cache_dir"))
+    shared = dict(options, source=source, output_path=output_path, source_info=source_info, topics=topics)
+    create_output_flow().run(shared)
+    return shared
+
+def run_batch(sources, max_workers=4, output_dir=".", **options):
+    """Process a batch of sources, running each distinct video only once
+
+    Returns a dict mapping every input source to its shared store; duplicate
+    sources map to the same result. Each distinct video is written to
+    <output_dir>/<key slug>.md. Options are passed to run_youtube_processor.
+    The HTML site index, if any, is written once after the whole batch.
+    """
+    from concurrent.futures import ThreadPoolExecutor
+
+    results = {}
+    sources_by_key = {}
+    for source in sources:
+        try:
+            key = canonical_source_key(source)
+        except (ValueError, FileNotFoundError) as e:
+            logger.error(f"Failed to process {source}: {e}")
+            results[source] = {"source": source, "error": str(e)}
+            continue
+        sources_by_key.setdefault(key, []).append(source)
+
+    duplicates = len(sources) - len(results) - len(sources_by_key)
+    if duplicates:
+        logger.info(f"Skipping {duplicates} duplicate sources in batch")
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {
+            key: executor.submit(
+                run_youtube_processor,
+                same_sources[0],
+                os.path.join(output_dir, f"{key_slug(key)}.md"),
+                **dict(options, flush_site_index=False)
+            )
+            for key, same_sources in sources_by_key.items()
+        }
+
+    if options.get("site_dir"):
+        from utils.site_index import get_site_index
+
+        get_site_index(options["site_dir"]).flush()
+
+    for key, same_sources in sources_by_key.items():
+        try:
+            shared = futures[key].result()
+        except Exception as e:
+            logger.error(f"Failed to process {same_sources[0]}: {e}")
+            shared = {"source": same_sources[0], "error": str(e)}
+        for source in same_sources:
+            results[source] = shared
+    return results
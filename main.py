@@ -2,19 +2,20 @@ import argparse
 import logging
 import sys
 import os
-from flow import create_youtube_processor_flow
-
-# Set up logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.StreamHandler(),
-        logging.FileHandler("youtube_processor.log")
-    ]
-)
+
 logger = logging.getLogger(__name__)
 
+def setup_logging():
+    """Configure logging once we know we are actually going to run the flow"""
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+        handlers=[
+            logging.StreamHandler(),
+            logging.FileHandler("youtube_processor.log")
+        ]
+    )
+
 def main():
     """Main function to run the YouTube content processor."""
     
@@ -25,36 +26,115 @@ def main():
     parser.add_argument(
         "--source", 
         type=str, 
-        help="YouTube video URL or local video file path to process",
+        nargs="+",
+        help="YouTube video URL(s) or local video file path(s) to process",
         required=False
     )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=4,
+        help="Number of sources to process concurrently in batch mode"
+    )
+    parser.add_argument(
+        "--output-dir",
+        type=str,
+        default=".",
+        help="Directory for per-video Markdown files in batch mode"
+    )
+    parser.add_argument(
+        "--cache-dir",
+        type=str,
+        default=os.path.join(".cache", "sources"),
+        help="Directory where fetched transcripts are cached by video (empty string to disable)"
+    )
+    parser.add_argument(
+        "--store-dir",
+        type=str,
+        default="results",
+        help="Directory where processed results are stored for re-rendering with render.py (empty string to disable)"
+    )
+    parser.add_argument(
+        "--site-dir",
+        type=str,
+        help="Also publish an HTML report per video into this static site, with an index page"
+    )
+    parser.add_argument(
+        "--index-db",
+        type=str,
+        help="Also add each video to this full-text search index (query it with `python -m utils.search_index`)"
+    )
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Fetch transcripts and build prompts, but only report projected calls, tokens, cost and time"
+    )
     args = parser.parse_args()
     
     # Get source from arguments or prompt user
-    source = args.source
-    if not source:
-        source = input("Enter YouTube URL or local video file path to process: ")
+    sources = args.source
+    if not sources:
+        sources = [input("Enter YouTube URL or local video file path to process: ")]
     
-    logger.info(f"Starting content processor for source: {source}")
+    setup_logging()
+    cache_dir = args.cache_dir or None
 
-    # Create flow
-    flow = create_youtube_processor_flow()
-    
-    # Initialize shared memory
-    shared = {
-        "source": source
-    }
-    
-    # Run the flow
-    flow.run(shared)
+    if args.dry_run:
+        from utils.cost_estimator import estimate_batch, format_estimate
+
+        estimate = estimate_batch(sources, max_workers=args.workers, cache_dir=cache_dir)
+        print(format_estimate(estimate))
+        return 1 if estimate["errors"] else 0
+
+    # Import the flow only now: it pulls in pocketflow, yaml and the LLM client
+    from flow import run_youtube_processor, run_batch
+
+    if len(sources) == 1:
+        logger.info(f"Starting content processor for source: {sources[0]}")
+        run_youtube_processor(
+            sources[0],
+            "output.md",
+            cache_dir=cache_dir,
+            store_dir=args.store_dir or None,
+            site_dir=args.site_dir,
+            index_path=args.index_db
+        )
+        output_files = [os.path.abspath("output.md")]
+        failed = []
+    else:
+        logger.info(f"Starting content processor for {len(sources)} sources")
+        os.makedirs(args.output_dir, exist_ok=True)
+        results = run_batch(
+            sources,
+            max_workers=args.workers,
+            output_dir=args.output_dir,
+            cache_dir=cache_dir,
+            store_dir=args.store_dir or None,
+            site_dir=args.site_dir,
+            index_path=args.index_db
+        )
+        output_files = sorted({
+            os.path.abspath(shared["output_path"])
+            for shared in results.values()
+            if "error" not in shared
+        })
+        failed = [source for source, shared in results.items() if "error" in shared]
+        for source in failed:
+            print(f"Failed to process {source}: {results[source]['error']}")
     
     # Report success and output file location
     print("\n" + "=" * 50)
-    print("Processing completed successfully!")
-    print(f"Output Markdown file: {os.path.abspath('output.md')}")
+    if failed:
+        print(f"Processing completed with {len(failed)} of {len(sources)} sources failed")
+    else:
+        print("Processing completed successfully!")
+    for output_file in output_files:
+        print(f"Output Markdown file: {output_file}")
+    if args.site_dir:
+        print(f"HTML site index: {os.path.abspath(os.path.join(args.site_dir, 'index.html'))}")
     print("=" * 50 + "\n")
 
-    return 0
+    return 1 if failed else 0
 
 if __name__ == "__main__":
     sys.exit(main())
@@ -0,0 +1,213 @@
+import argparse
+import hashlib
+import json
+import logging
+import os
+import sys
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_NAME = ".render_manifest.json"
+FORMATS = ("md", "html")
+
+def file_hash(path):
+    """SHA-256 of a file's bytes"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def template_hashes():
+    """Hash of the generator module behind each output format"""
+    from utils import markdown_generator
+    from utils.site_index import template_hash
+
+    return {
+        "md": file_hash(markdown_generator.__file__),
+        "html": template_hash()
+    }
+
+def _write_text(path, content):
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(content)
+    os.replace(tmp_path, path)
+
+def render_record(record_path, out_dir, formats):
+    """Render one stored record; runs in a worker process
+
+    Returns what the parent needs for the HTML site index, without the
+    transcript and segments so little data crosses the process boundary.
+    """
+    from utils.result_store import load_record
+    from utils.site_index import report_slug, UNSHOWN_FIELDS
+
+    record = load_record(record_path)
+    source_info = record["source_info"]
+    topics = record["topics"]
+    slug = report_slug(source_info)
+
+    if "md" in formats:
+        from utils.markdown_generator import generate_markdown
+
+        _write_text(os.path.join(out_dir, f"{slug}.md"), generate_markdown(source_info, topics))
+    if "html" in formats:
+        from utils.html_generator import write_report
+
+        write_report(os.path.join(out_dir, f"{slug}.html"), source_info, topics)
+
+    return {
+        "source_info": {key: value for key, value in source_info.items() if key not in UNSHOWN_FIELDS},
+        "topics": topics
+    }
+
+def select_records(store_dir, sources=None):
+    """Record paths for the given sources (URLs, file paths or source keys), or all
+
+    Raises FileNotFoundError or ValueError for a source that can't be resolved
+    or has no stored record.
+    """
+    from utils.result_store import list_records, record_path
+    from utils.source_key import canonical_source_key
+
+    if not sources:
+        return list_records(store_dir)
+
+    paths = []
+    for source in sources:
+        key = source if source.startswith(("youtube:", "file:")) else canonical_source_key(source)
+        path = record_path(store_dir, key)
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"No stored results for {source} in {store_dir}")
+        paths.append(path)
+    return paths
+
+def render_store(store_dir, out_dir, formats=FORMATS, sources=None, max_workers=None, force=False):
+    """Re-render Markdown/HTML from stored results without re-running the pipeline
+
+    A record is skipped when its file hash and the template hash of every
+    requested format match the last render and its outputs still exist.
+    Returns counts of rendered, skipped and failed records.
+    """
+    from concurrent.futures import ProcessPoolExecutor
+    from utils.result_store import RECORD_SUFFIX
+    from utils.site_index import get_site_index
+
+    os.makedirs(out_dir, exist_ok=True)
+    manifest_path = os.path.join(out_dir, MANIFEST_NAME)
+    manifest = {}
+    if os.path.exists(manifest_path):
+        with open(manifest_path) as f:
+            manifest = json.load(f)
+
+    templates = template_hashes()
+    pending = {}
+    skipped = 0
+    for path in select_records(store_dir, sources):
+        name = os.path.basename(path)
+        input_hash = file_hash(path)
+        state = {fmt: f"{input_hash}:{templates[fmt]}" for fmt in formats}
+        # Records are named after the same key slug as their reports
+        slug = name[:-len(RECORD_SUFFIX)]
+        if not force and all(
+            manifest.get(name, {}).get(fmt) == value and os.path.exists(os.path.join(out_dir, f"{slug}.{fmt}"))
+            for fmt, value in state.items()
+        ):
+            skipped += 1
+            continue
+        pending[path] = state
+
+    site = get_site_index(out_dir) if "html" in formats else None
+    if site and pending:
+        site.ensure_stylesheet()
+
+    rendered = 0
+    failed = 0
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        futures = {
+            path: executor.submit(render_record, path, out_dir, tuple(formats))
+            for path in pending
+        }
+        for path, future in futures.items():
+            try:
+                result = future.result()
+            except Exception as e:
+                logger.error(f"Failed to render {path}: {e}")
+                failed += 1
+                continue
+            if site:
+                site.add_entry(result["source_info"], result["topics"])
+            manifest.setdefault(os.path.basename(path), {}).update(pending[path])
+            rendered += 1
+
+    if site:
+        site.flush()
+    _write_text(manifest_path, json.dumps(manifest))
+    return {"rendered": rendered, "skipped": skipped, "failed": failed}
+
+def main():
+    """Regenerate reports from stored results."""
+    parser = argparse.ArgumentParser(
+        description="Re-render Markdown and HTML reports from stored results without re-running the pipeline."
+    )
+    parser.add_argument(
+        "--store-dir",
+        type=str,
+        default="results",
+        help="Directory of stored results written by main.py"
+    )
+    parser.add_argument(
+        "--out-dir",
+        type=str,
+        default="rendered",
+        help="Directory for rendered reports (HTML output also gets style.css and index.html)"
+    )
+    parser.add_argument(
+        "--source",
+        type=str,
+        nargs="+",
+        help="Only render these videos (URL, file path or source key); default is the whole store"
+    )
+    parser.add_argument(
+        "--format",
+        choices=FORMATS,
+        nargs="+",
+        default=list(FORMATS),
+        help="Output formats to render"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        help="Number of render processes (default: one per CPU)"
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Render every selected record even if its inputs and templates are unchanged"
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
+
+    try:
+        counts = render_store(
+            args.store_dir,
+            args.out_dir,
+            formats=args.format,
+            sources=args.source,
+            max_workers=args.workers,
+            force=args.force
+        )
+    except (FileNotFoundError, ValueError) as e:
+        print(f"Error: {e}")
+        return 1
+    print(f"Rendered {counts['rendered']}, skipped {counts['skipped']} unchanged, "
+          f"{counts['failed']} failed -> {os.path.abspath(args.out_dir)}")
+    return 1 if counts["failed"] else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
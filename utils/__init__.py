@@ -1 +1,22 @@
-from .youtube_processor import *
+# Submodules pull in heavy SDKs (requests, bs4, youtube_transcript_api,
+# anthropic), so nothing is imported here eagerly. Names that used to be
+# re-exported via `from .youtube_processor import *` are resolved on first
+# attribute access instead.
+import importlib
+
+_LAZY_ATTRS = {
+    "extract_video_id": ".youtube_processor",
+    "get_video_info": ".youtube_processor",
+    "canonical_video_url": ".youtube_processor",
+}
+
+__all__ = list(_LAZY_ATTRS)
+
+
+def __getattr__(name):
+    module_name = _LAZY_ATTRS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
@@ -1,19 +1,53 @@
-from anthropic import AnthropicVertex
 import os
+import json
+import time
+import threading
+from functools import lru_cache
 
-def call_llm(prompt: str) -> str:
-    client = AnthropicVertex(
+MODEL = "claude-3-5-sonnet"
+MAX_TOKENS = 1024
+
+# Every call appends one JSON line here; the dry-run estimator uses it as
+# historical latency and token data
+STATS_PATH = os.getenv("LLM_STATS_PATH", "llm_stats.jsonl")
+_stats_lock = threading.Lock()
+
+@lru_cache(maxsize=1)
+def _get_client():
+    """Create the Anthropic client on first use; the SDK is slow to import"""
+    from anthropic import AnthropicVertex
+
+    return AnthropicVertex(
         region=os.getenv("ANTHROPIC_REGION", "us-east5"),
         project_id=os.getenv("ANTHROPIC_PROJECT_ID", "")
     )
+
+def _record_call(record):
+    """Append one call's stats to STATS_PATH; stats are best effort"""
+    try:
+        with _stats_lock, open(STATS_PATH, "a") as f:
+            f.write(json.dumps(record) + "\n")
+    except OSError:
+        pass
+
+def call_llm(prompt: str) -> str:
+    client = _get_client()
+    start = time.perf_counter()
     response = client.messages.create(
-        max_tokens=1024,
+        max_tokens=MAX_TOKENS,
         messages=[{"role": "user", "content": prompt}],
-        model="claude-3-5-sonnet"
+        model=MODEL
     )
+    _record_call({
+        "time": time.time(),
+        "model": MODEL,
+        "prompt_chars": len(prompt),
+        "input_tokens": response.usage.input_tokens,
+        "output_tokens": response.usage.output_tokens,
+        "latency_s": round(time.perf_counter() - start, 3)
+    })
     return response.content[0].text
 
-if __name__ == "__main__":
 if __name__ == "__main__":
     test_prompts = [
         "Hello, how are you?",
@@ -0,0 +1,279 @@
+from typing import Any, Dict, List, Optional, Tuple
+import heapq
+import json
+import math
+import os
+import time
+from utils.call_llm import MAX_TOKENS, MODEL, STATS_PATH
+from utils.prompts import build_topics_prompt, build_content_prompt, MAX_TOPICS, MAX_QUESTIONS_PER_TOPIC
+
+# Fallbacks used until llm_stats.jsonl has real calls in it
+DEFAULT_CHARS_PER_TOKEN = 3.5
+DEFAULT_CALL_OVERHEAD_S = 2.0
+DEFAULT_SECONDS_PER_INPUT_TOKEN = 0.0001
+DEFAULT_SECONDS_PER_OUTPUT_TOKEN = 0.02
+
+# Uncached local files are not transcribed in a dry run; their transcript
+# size and Whisper time are projected from the audio duration instead
+SPEECH_CHARS_PER_SECOND = 15.0
+WHISPER_SECONDS_PER_AUDIO_SECOND = 0.1
+
+# USD per million tokens for MODEL
+PRICE_INPUT_PER_MTOK = float(os.getenv("LLM_PRICE_INPUT_PER_MTOK", "3.0"))
+PRICE_OUTPUT_PER_MTOK = float(os.getenv("LLM_PRICE_OUTPUT_PER_MTOK", "15.0"))
+# USD per minute of audio for Whisper transcription
+PRICE_WHISPER_PER_MINUTE = float(os.getenv("WHISPER_PRICE_PER_MINUTE", "0.006"))
+
+
+def load_call_history(path: str = STATS_PATH) -> List[Dict[str, Any]]:
+    """Read the per-call records that call_llm appends to its stats file"""
+    if not os.path.exists(path):
+        return []
+    records = []
+    with open(path) as f:
+        for line in f:
+            try:
+                records.append(json.loads(line))
+            except ValueError:
+                continue
+    return records
+
+
+def _fit_latency(points: List[Tuple[float, float, float]]) -> Tuple[float, float, float]:
+    """Least-squares fit of latency = overhead + per_input * input_tokens + per_output * output_tokens
+
+    When the history doesn't vary one of the token counts independently of
+    the other, that slope keeps its default and only the other is fitted.
+    """
+    per_input, per_output = DEFAULT_SECONDS_PER_INPUT_TOKEN, DEFAULT_SECONDS_PER_OUTPUT_TOKEN
+    if not points:
+        return DEFAULT_CALL_OVERHEAD_S, per_input, per_output
+
+    n = len(points)
+    mean_i = sum(i for i, _, _ in points) / n
+    mean_o = sum(o for _, o, _ in points) / n
+    mean_y = sum(y for _, _, y in points) / n
+    s_ii = sum((i - mean_i) ** 2 for i, _, _ in points)
+    s_oo = sum((o - mean_o) ** 2 for _, o, _ in points)
+    s_io = sum((i - mean_i) * (o - mean_o) for i, o, _ in points)
+    s_iy = sum((i - mean_i) * (y - mean_y) for i, _, y in points)
+    s_oy = sum((o - mean_o) * (y - mean_y) for _, o, y in points)
+
+    det = s_ii * s_oo - s_io ** 2
+    if det > 1e-9 * s_ii * s_oo:
+        per_input = (s_iy * s_oo - s_oy * s_io) / det
+        per_output = (s_oy * s_ii - s_iy * s_io) / det
+        # A negative slope is noise; drop it and fit the other one alone
+        if per_input < 0:
+            per_input, per_output = 0.0, s_oy / s_oo
+        elif per_output < 0:
+            per_input, per_output = s_iy / s_ii, 0.0
+    elif s_oo > 0:
+        per_output = (s_oy - per_input * s_io) / s_oo
+    elif s_ii > 0:
+        per_input = (s_iy - per_output * s_io) / s_ii
+
+    per_input, per_output = max(0.0, per_input), max(0.0, per_output)
+    overhead = max(0.0, mean_y - per_input * mean_i - per_output * mean_o)
+    return overhead, per_input, per_output
+
+
+class CallModel:
+    """Local token counting and per-call latency, calibrated from call history"""
+    def __init__(self, history: List[Dict[str, Any]]):
+        history = [r for r in history if r.get("model", MODEL) == MODEL]
+        self.history_size = len(history)
+
+        # Calibrate characters per token against the token counts the API reported
+        counted = [r for r in history if r.get("prompt_chars") and r.get("input_tokens")]
+        if counted:
+            self.chars_per_token = sum(r["prompt_chars"] for r in counted) / sum(r["input_tokens"] for r in counted)
+        else:
+            self.chars_per_token = DEFAULT_CHARS_PER_TOKEN
+
+        # Without history assume every call uses its full output budget
+        outputs = [r["output_tokens"] for r in history if r.get("output_tokens")]
+        self.output_tokens_per_call = min(MAX_TOKENS, sum(outputs) / len(outputs)) if outputs else MAX_TOKENS
+
+        self.overhead_s, self.seconds_per_input_token, self.seconds_per_output_token = _fit_latency([
+            (r["input_tokens"], r["output_tokens"], r["latency_s"])
+            for r in history if "input_tokens" in r and "output_tokens" in r and "latency_s" in r
+        ])
+
+    def count_tokens(self, text: str) -> int:
+        return math.ceil(len(text) / self.chars_per_token)
+
+    def latency(self, input_tokens: float, output_tokens: float) -> float:
+        return self.overhead_s + self.seconds_per_input_token * input_tokens \
+            + self.seconds_per_output_token * output_tokens
+
+
+def build_prompts(source_info: Dict[str, Any]) -> List[str]:
+    """Every prompt the flow would send for a source
+
+    The content prompts depend on topics the LLM has not produced yet, so the
+    worst case (MAX_TOPICS topics of MAX_QUESTIONS_PER_TOPIC questions) is
+    built with placeholder titles and questions.
+    """
+    title = source_info.get("title", "")
+    transcript = source_info.get("transcript", "")
+    prompts = [build_topics_prompt(title, transcript)]
+    for i in range(MAX_TOPICS):
+        questions = [f"Placeholder question {j + 1} about topic {i + 1}?" for j in range(MAX_QUESTIONS_PER_TOPIC)]
+        prompts.append(build_content_prompt(f"Placeholder topic {i + 1}", questions, transcript))
+    return prompts
+
+
+def estimate_source(source_info: Dict[str, Any], model: CallModel) -> Dict[str, Any]:
+    """Project calls, tokens and sequential LLM time for one processed source"""
+    prompts = build_prompts(source_info)
+    prompt_tokens = [model.count_tokens(prompt) for prompt in prompts]
+    input_tokens = sum(prompt_tokens)
+    output_tokens = model.output_tokens_per_call * len(prompts)
+    # The flow sends its prompts one after another
+    llm_seconds = sum(model.latency(tokens, model.output_tokens_per_call) for tokens in prompt_tokens)
+    return {
+        "title": source_info.get("title", ""),
+        "source_key": source_info.get("source_key"),
+        "transcript_chars": len(source_info.get("transcript", "")),
+        "calls": len(prompts),
+        "input_tokens": input_tokens,
+        "output_tokens": round(output_tokens),
+        "llm_seconds": llm_seconds
+    }
+
+
+def schedule_wall_time(durations: List[float], max_workers: int) -> float:
+    """Makespan of running jobs on max_workers workers, longest job first"""
+    workers = [0.0] * max(1, min(max_workers, len(durations)))
+    for duration in sorted(durations, reverse=True):
+        heapq.heappush(workers, heapq.heappop(workers) + duration)
+    return max(workers) if durations else 0.0
+
+
+def estimate_batch(sources: List[str], max_workers: int = 4, cache_dir: Optional[str] = None,
+                   history_path: str = STATS_PATH) -> Dict[str, Any]:
+    """Dry run: fetch (or load cached) transcripts and project the cost of a batch
+
+    No prompt is sent. Transcript fetch time is measured here; when cache_dir
+    is set the real run will load the cached transcript instead, so fetch time
+    is left out of the projected wall time. Local files without a cached
+    transcript are not transcribed (that would run ffmpeg and a paid Whisper
+    call): their transcript size, Whisper cost and time are projected from
+    the file's duration.
+    """
+    from concurrent.futures import ThreadPoolExecutor
+    from utils.media_processor import MediaProcessor, probe_duration
+    from utils.source_key import canonical_source
+
+    model = CallModel(load_call_history(history_path))
+    processor = MediaProcessor(cache_dir=cache_dir)
+
+    sources_by_key = {}
+    errors = {}
+    for source in sources:
+        try:
+            canonical = canonical_source(source)
+        except (ValueError, FileNotFoundError) as e:
+            errors[source] = str(e)
+            continue
+        sources_by_key.setdefault(canonical["key"], (source, canonical))
+    duplicates = len(sources) - len(sources_by_key) - len(errors)
+
+    def fetch(source, canonical):
+        start = time.perf_counter()
+        if canonical["type"] == "local" and not processor.is_cached(canonical["key"]):
+            duration = probe_duration(canonical["location"])
+            source_info = {
+                "title": os.path.basename(canonical["location"]),
+                "source_key": canonical["key"],
+                "transcript": " " * round(duration * SPEECH_CHARS_PER_SECOND),
+                "duration": duration
+            }
+        else:
+            source_info = processor.process_source(source)
+            duration = None
+        return source_info, duration, time.perf_counter() - start
+
+    estimates = []
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {source: executor.submit(fetch, source, canonical) for source, canonical in sources_by_key.values()}
+        for source, future in futures.items():
+            try:
+                source_info, transcribe_duration, fetch_seconds = future.result()
+            except Exception as e:
+                errors[source] = str(e)
+                continue
+            estimate = estimate_source(source_info, model)
+            estimate["fetch_seconds"] = fetch_seconds
+            estimate["seconds"] = estimate["llm_seconds"] + (0.0 if cache_dir else fetch_seconds)
+            estimate["transcription_minutes"] = 0.0
+            estimate["transcription_usd"] = 0.0
+            if transcribe_duration is not None:
+                # The real run extracts the audio and transcribes it first
+                estimate["transcription_minutes"] = transcribe_duration / 60
+                estimate["transcription_usd"] = transcribe_duration / 60 * PRICE_WHISPER_PER_MINUTE
+                estimate["seconds"] += transcribe_duration * WHISPER_SECONDS_PER_AUDIO_SECOND
+            estimates.append(estimate)
+
+    input_tokens = sum(e["input_tokens"] for e in estimates)
+    output_tokens = sum(e["output_tokens"] for e in estimates)
+    llm_cost = (input_tokens * PRICE_INPUT_PER_MTOK + output_tokens * PRICE_OUTPUT_PER_MTOK) / 1_000_000
+    transcription_cost = sum(e["transcription_usd"] for e in estimates)
+    return {
+        "model": MODEL,
+        "history_calls": model.history_size,
+        "max_workers": max_workers,
+        "distinct": len(sources_by_key),
+        "duplicates": duplicates,
+        "sources": estimates,
+        "errors": errors,
+        "calls": sum(e["calls"] for e in estimates),
+        "input_tokens": input_tokens,
+        "output_tokens": output_tokens,
+        "llm_cost_usd": llm_cost,
+        "transcription_cost_usd": transcription_cost,
+        "cost_usd": llm_cost + transcription_cost,
+        "wall_seconds": schedule_wall_time([e["seconds"] for e in estimates], max_workers)
+    }
+
+
+def format_estimate(estimate: Dict[str, Any]) -> str:
+    """Human-readable dry-run report"""
+    lines = [
+        f"Dry run for {estimate['distinct']} distinct sources "
+        f"({estimate['duplicates']} duplicates skipped, {len(estimate['errors'])} failed)",
+        f"Model: {estimate['model']} (calibrated from {estimate['history_calls']} past calls)",
+        ""
+    ]
+    for e in estimate["sources"]:
+        transcription = (
+            f", Whisper ~${e['transcription_usd']:.2f} for {e['transcription_minutes']:.1f} min of audio"
+            if e["transcription_minutes"] else ""
+        )
+        lines.append(
+            f"- {e['title']}: {e['calls']} calls, ~{e['input_tokens']:,} input / "
+            f"~{e['output_tokens']:,} output tokens{transcription}, ~{e['seconds'] / 60:.1f} min"
+        )
+    for source, error in estimate["errors"].items():
+        lines.append(f"- {source}: ✗ {error}")
+    lines.extend([
+        "",
+        f"Total calls: {estimate['calls']}",
+        f"Total tokens: ~{estimate['input_tokens']:,} input, ~{estimate['output_tokens']:,} output",
+        f"Estimated cost: ~${estimate['cost_usd']:.2f} "
+        f"(LLM ~${estimate['llm_cost_usd']:.2f}, transcription ~${estimate['transcription_cost_usd']:.2f})",
+        f"Estimated wall time with {estimate['max_workers']} workers: ~{estimate['wall_seconds'] / 60:.1f} min"
+    ])
+    return "\n".join(lines)
+
+
+if __name__ == "__main__":
+    test_source = {
+        "title": "Introduction to TensorFlow",
+        "source_key": "youtube:example1234",
+        "transcript": "TensorFlow is an open-source machine learning framework. " * 2000
+    }
+    model = CallModel(load_call_history())
+    print(estimate_source(test_source, model))
+    print(f"Wall time for 10 x 60s jobs on 4 workers: {schedule_wall_time([60.0] * 10, 4)}s")
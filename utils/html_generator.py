@@ -1,27 +1,50 @@
-def html_generator(title, image_url, sections):
-    """
-    Generates an HTML string with a handwriting style using Tailwind CSS.
+from typing import Any, Dict, Iterable, List, Optional, TextIO
+import html
+import io
+import os
 
-    :param title: Main title for the page ("Title 1").
-    :param image_url: URL of the image to be placed below the main title.
-    :param sections: A list of dictionaries, each containing:
-        {
-            "title": str (Title for the section e.g. "Title 2"),
-            "bullets": [
-                ("bold_text", "regular_text"),
-                ("bold_text_2", "regular_text_2"),
-                ...
-            ]
-        }
-    :return: A string of HTML content.
-    """
-    # Start building the HTML
-    html_template = f"""<!DOCTYPE html>
+STYLESHEET_NAME = "style.css"
+
+# Shared by every page: html_generator inlines it, reports link to a single
+# copy written by write_stylesheet
+STYLESHEET = """body {
+  background-color: #f7fafc;
+  font-family: 'Patrick Hand', sans-serif;
+}
+h1, h2 {
+  font-weight: 700;
+  margin-bottom: 0.5rem;
+}
+ul {
+  list-style-type: disc;
+  margin-left: 1.5rem;
+  margin-bottom: 1.5rem;
+}
+li {
+  margin-bottom: 1rem;
+}
+ol {
+  list-style-type: decimal;
+  margin-left: 2rem;
+  margin-top: 0.5rem;
+}
+ol li {
+  margin-bottom: 0.2rem;
+}
+.bullet-content ol {
+  margin-top: 0.3rem;
+  margin-bottom: 0.3rem;
+}
+"""
+
+def write_head(out: TextIO, page_title: str = "Youtube Made Simple", stylesheet_href: Optional[str] = None):
+    """Write the document head, linking stylesheet_href or inlining STYLESHEET"""
+    out.write(f"""<!DOCTYPE html>
 <html lang=\"en\">
 <head>
   <meta charset=\"UTF-8\" />
   <meta name=\"viewport\" content=\"width=device-width, initial-scale=1.0\" />
-  <title>Youtube Made Simple</title>
+  <title>{page_title}</title>
   <!-- Using Tailwind CSS CDN -->
   <link
     rel=\"stylesheet\"
@@ -33,38 +56,21 @@ def html_generator(title, image_url, sections):
     href=\"https://fonts.googleapis.com/css2?family=Patrick+Hand&display=swap\"
     rel=\"stylesheet\"
   />
-  <style>
-    body {{
-      background-color: #f7fafc;
-      font-family: 'Patrick Hand', sans-serif;
-    }}
-    h1, h2 {{
-      font-weight: 700;
-      margin-bottom: 0.5rem;
-    }}
-    ul {{
-      list-style-type: disc;
-      margin-left: 1.5rem;
-      margin-bottom: 1.5rem;
-    }}
-    li {{
-      margin-bottom: 1rem;
-    }}
-    ol {{
-      list-style-type: decimal;
-      margin-left: 2rem;
-      margin-top: 0.5rem;
-    }}
-    ol li {{
-      margin-bottom: 0.2rem;
-    }}
-    .bullet-content ol {{
-      margin-top: 0.3rem;
-      margin-bottom: 0.3rem;
-    }}
-  </style>
-</head>
-<body class=\"min-h-screen flex items-center justify-center p-4\">
+""")
+    if stylesheet_href:
+        out.write(f'  <link rel="stylesheet" href="{stylesheet_href}" />\n')
+    else:
+        out.write("  <style>\n")
+        for line in STYLESHEET.splitlines():
+            out.write(f"    {line}\n")
+        out.write("  </style>\n")
+    out.write("</head>\n")
+
+def write_page(out: TextIO, title: str, image_url: Optional[str], sections: Iterable[Dict[str, Any]],
+               stylesheet_href: Optional[str] = None, page_title: str = "Youtube Made Simple"):
+    """Stream a full page to out in one pass; see html_generator for the arguments"""
+    write_head(out, page_title, stylesheet_href)
+    out.write(f"""<body class=\"min-h-screen flex items-center justify-center p-4\">
   <div class=\"max-w-2xl w-full bg-white rounded-2xl shadow-lg p-6\">
     <!-- Attribution header -->
     <div class="mb-6 text-right text-gray-500 text-sm">
@@ -76,41 +82,100 @@ def html_generator(title, image_url, sections):
     </div>
     
     <!-- Title 1 -->
-    <h1 class=\"text-4xl text-gray-800 mb-4\">{title}</h1>
+    <h1 class=\"text-4xl text-gray-800 mb-4\">{title}</h1>""")
+    if image_url:
+        out.write(f"""
     <!-- Image below Title 1 -->
     <img
       src=\"{image_url}\"
       alt=\"Placeholder image\"
       class=\"rounded-xl mb-6\"
-    />"""
+    />""")
 
     # For each section, add a sub-title (Title 2, etc.) and bullet points.
     for section in sections:
-        section_title = section.get("title", "")
-        bullets = section.get("bullets", [])
-
-        # Add the section's title (Title 2, Title 3, etc.)
-        html_template += f"""
-    <h2 class=\"text-2xl text-gray-800 mb-4\">{section_title}</h2>
-    <ul class=\"text-gray-600\">"""
+        out.write(f"""
+    <h2 class=\"text-2xl text-gray-800 mb-4\">{section.get("title", "")}</h2>
+    <ul class=\"text-gray-600\">""")
 
         # Create list items for each bullet pair
-        for bold_text, normal_text in bullets:
-            html_template += f"""
+        for bold_text, normal_text in section.get("bullets", []):
+            out.write(f"""
       <li>
         <strong>{bold_text}</strong><br />
         <div class="bullet-content">{normal_text}</div>
-      </li>"""
+      </li>""")
 
-        html_template += "\n    </ul>"
+        out.write("\n    </ul>")
 
     # Close the main container and body
-    html_template += """
+    out.write("""
   </div>
 </body>
-</html>"""
+</html>""")
+
+def html_generator(title, image_url, sections):
+    """
+    Generates an HTML string with a handwriting style using Tailwind CSS.
+
+    :param title: Main title for the page ("Title 1").
+    :param image_url: URL of the image to be placed below the main title.
+    :param sections: A list of dictionaries, each containing:
+        {
+            "title": str (Title for the section e.g. "Title 2"),
+            "bullets": [
+                ("bold_text", "regular_text"),
+                ("bold_text_2", "regular_text_2"),
+                ...
+            ]
+        }
+    :return: A string of HTML content.
+    """
+    out = io.StringIO()
+    write_page(out, title, image_url, sections)
+    return out.getvalue()
+
+def topics_to_sections(topics: List[Dict[str, Any]]) -> Iterable[Dict[str, Any]]:
+    """Map shared["topics"] to html_generator sections
+
+    Titles and questions are plain text and get escaped; answers are HTML
+    produced by the LLM and are kept as is.
+    """
+    for topic in topics:
+        yield {
+            "title": html.escape(topic.get("rephrased_title") or topic.get("title", "")),
+            "bullets": [
+                (html.escape(q.get("rephrased") or q.get("original", "")), q.get("answer", ""))
+                for q in topic.get("questions", [])
+            ]
+        }
+
+def render_report(out: TextIO, source_info: Dict[str, Any], topics: List[Dict[str, Any]],
+                  stylesheet_href: Optional[str] = STYLESHEET_NAME):
+    """Stream the HTML report for one processed source to out"""
+    title = html.escape(source_info.get("title", ""))
+    write_page(out, title, source_info.get("thumbnail_url"), topics_to_sections(topics),
+               stylesheet_href=stylesheet_href, page_title=title)
+
+def write_report(path: str, source_info: Dict[str, Any], topics: List[Dict[str, Any]],
+                 stylesheet_href: Optional[str] = STYLESHEET_NAME):
+    """Render a report straight to path, replacing any previous file atomically"""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        render_report(f, source_info, topics, stylesheet_href)
+    os.replace(tmp_path, path)
 
-    return html_template
+def write_stylesheet(site_dir: str) -> str:
+    """Write the shared stylesheet into site_dir unless it is already current"""
+    path = os.path.join(site_dir, STYLESHEET_NAME)
+    if os.path.exists(path):
+        with open(path, encoding="utf-8") as f:
+            if f.read() == STYLESHEET:
+                return path
+    os.makedirs(site_dir, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(STYLESHEET)
+    return path
 
 if __name__ == "__main__":
     sections_data = [
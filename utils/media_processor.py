@@ -1,19 +1,48 @@
 
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 import os
 import subprocess
+import tempfile
 import json
-import requests
-from utils.youtube_processor import get_video_info
+from utils.source_key import canonical_source, key_slug
+from utils.single_flight import SingleFlight
+from utils.transcript_segments import TranscriptSegments, attach_segments, detach_segments
+
+# Shared by all processors so concurrent requests for the same video or file
+# fetch and transcribe it only once
+_inflight_sources = SingleFlight()
+
+def probe_duration(file_path: str) -> float:
+    """Duration of a media file in seconds, read with ffprobe without decoding it"""
+    if not os.path.exists(file_path):
+        raise FileNotFoundError(f"Video file not found: {file_path}")
+    cmd = [
+        "ffprobe", "-v", "error",
+        "-show_entries", "format=duration",
+        "-of", "default=noprint_wrappers=1:nokey=1",
+        file_path
+    ]
+    try:
+        result = subprocess.run(cmd, check=True, capture_output=True, text=True)
+        return float(result.stdout.strip())
+    except (subprocess.CalledProcessError, ValueError) as e:
+        raise RuntimeError(f"Failed to read duration: {e}")
 
 class MediaProcessor:
-    def __init__(self):
+    def __init__(self, cache_dir: Optional[str] = None):
+        """
+        :param cache_dir: Optional directory where processed sources are cached
+            as JSON by source key, so transcripts are fetched only once. When
+            there is segment timing, the transcript and timing are saved next to
+            it as a memory-mappable .seg file instead of in the JSON.
+        """
         self.whisper_api_key = os.getenv("WHISPER_API_KEY")
-        if not self.whisper_api_key:
-            raise ValueError("WHISPER_API_KEY environment variable not set")
+        self.cache_dir = cache_dir
 
     def process_youtube(self, url: str) -> Dict[str, Any]:
         """Process YouTube URL to get video info and transcript"""
+        from utils.youtube_processor import get_video_info
+
         video_info = get_video_info(url)
         if "error" in video_info:
             raise ValueError(f"Error processing YouTube video: {video_info['error']}")
@@ -23,18 +52,23 @@ class MediaProcessor:
             "location": url,
             "title": video_info["title"],
             "transcript": video_info["transcript"],
+            "segments": video_info["segments"],
             "thumbnail_url": video_info["thumbnail_url"],
             "video_id": video_info["video_id"],
-            "duration": 0  # TODO: Add duration extraction
+            "duration": video_info["duration"]
         }
 
     def process_local_file(self, file_path: str) -> Dict[str, Any]:
         """Process local video file to get transcript"""
         if not os.path.exists(file_path):
             raise FileNotFoundError(f"Video file not found: {file_path}")
+        if not self.whisper_api_key:
+            raise ValueError("WHISPER_API_KEY environment variable not set")
 
-        # Extract audio using ffmpeg
-        audio_path = "temp_audio.wav"
+        # Extract audio using ffmpeg into a per-call temp file, so concurrent
+        # transcriptions of different files don't overwrite each other
+        fd, audio_path = tempfile.mkstemp(suffix=".wav")
+        os.close(fd)
         cmd = [
             "ffmpeg", "-y", "-i", file_path,
             "-vn", "-acodec", "pcm_s16le",
@@ -45,16 +79,20 @@ class MediaProcessor:
         try:
             subprocess.run(cmd, check=True, capture_output=True)
         except subprocess.CalledProcessError as e:
+            os.remove(audio_path)
             raise RuntimeError(f"Failed to extract audio: {e}")
 
         # Generate transcript using Whisper API
+        import requests
+
         try:
             with open(audio_path, "rb") as audio:
                 response = requests.post(
                     "https://api.openai.com/v1/audio/transcriptions",
                     headers={"Authorization": f"Bearer {self.whisper_api_key}"},
                     files={"file": audio},
-                    data={"model": "whisper-1"}
+                    # verbose_json adds per-segment start/end times
+                    data={"model": "whisper-1", "response_format": "verbose_json"}
                 )
                 response.raise_for_status()
                 transcript_data = response.json()
@@ -63,28 +101,98 @@ class MediaProcessor:
             if os.path.exists(audio_path):
                 os.remove(audio_path)
 
+        if transcript_data.get("segments"):
+            segments = TranscriptSegments.from_entries(
+                dict(segment, text=segment["text"].strip()) for segment in transcript_data["segments"]
+            )
+            transcript = segments.text
+            duration = transcript_data.get("duration") or segments.duration
+        else:
+            transcript = transcript_data["text"]
+            segments = None
+            duration = transcript_data.get("duration", 0)
+
         return {
             "type": "local",
             "location": file_path,
             "title": os.path.basename(file_path),
-            "transcript": transcript_data["text"],
+            "transcript": transcript,
+            "segments": segments,
             "thumbnail_url": None,
             "video_id": None,
-            "duration": 0  # TODO: Add duration extraction
+            "duration": duration
         }
 
     def process_source(self, source: str) -> Dict[str, Any]:
-        """Process either YouTube URL or local file"""
-        if source.startswith(("http://", "https://")):
-            return self.process_youtube(source)
+        """Process either YouTube URL or local file
+
+        The source is first mapped to its canonical key, and concurrent calls
+        for the same key share one fetch/transcription. source_info["segments"]
+        holds the TranscriptSegments, or None for a transcript without timing.
+        """
+        canonical = canonical_source(source)
+        source_info = _inflight_sources.do(canonical["key"], self._load_or_process, canonical)
+        return dict(source_info, source_key=canonical["key"])
+
+    def is_cached(self, key: str) -> bool:
+        """Whether process_source would load this source key from the cache"""
+        return self._load_cached(key) is not None
+
+    def _cache_path(self, key: str) -> Optional[str]:
+        if not self.cache_dir:
+            return None
+        return os.path.join(self.cache_dir, f"{key_slug(key)}.json")
+
+    def _segments_path(self, key: str) -> Optional[str]:
+        if not self.cache_dir:
+            return None
+        return os.path.join(self.cache_dir, f"{key_slug(key)}.seg")
+
+    def _load_cached(self, key: str) -> Optional[Dict[str, Any]]:
+        """Cached source info for a key, or None on a miss"""
+        cache_path = self._cache_path(key)
+        if not cache_path or not os.path.exists(cache_path):
+            return None
+        with open(cache_path) as f:
+            data = json.load(f)
+
+        segments_path = self._segments_path(key)
+        if os.path.exists(segments_path):
+            return attach_segments(data, segments_path)
+        if "transcript" not in data:
+            # The .seg file holding the transcript is gone; process again
+            return None
+        return dict(data, segments=None)
+
+    def _load_or_process(self, canonical: Dict[str, str]) -> Dict[str, Any]:
+        """Return the cached source info for a canonical source, processing it on a miss"""
+        source_info = self._load_cached(canonical["key"])
+        if source_info is not None:
+            return source_info
+
+        if canonical["type"] == "youtube":
+            source_info = self.process_youtube(canonical["location"])
         else:
-            return self.process_local_file(source)
+            source_info = self.process_local_file(canonical["location"])
+
+        cache_path = self._cache_path(canonical["key"])
+        if cache_path:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            data, segments = detach_segments(source_info)
+            if segments is not None:
+                segments.save(self._segments_path(canonical["key"]))
+            elif os.path.exists(self._segments_path(canonical["key"])):
+                os.remove(self._segments_path(canonical["key"]))
+            tmp_path = f"{cache_path}.tmp"
+            with open(tmp_path, "w") as f:
+                json.dump(data, f)
+            os.replace(tmp_path, cache_path)
+        return source_info
 
 
 def main():
     """Test function for MediaProcessor"""
     import argparse
-    import json
 
     parser = argparse.ArgumentParser(description='Process video files or YouTube URLs for transcription')
     parser.add_argument('source', help='YouTube URL or path to local video file')
@@ -94,6 +202,8 @@ def main():
     try:
         processor = MediaProcessor()
         result = processor.process_source(args.source)
+        # Segment timing is binary; print the rest
+        result.pop("segments", None)
         
         if args.pretty:
             print(json.dumps(result, indent=2))
@@ -0,0 +1,73 @@
+from typing import List
+
+# The topics prompt asks for at most this many topics and questions per topic
+MAX_TOPICS = 5
+MAX_QUESTIONS_PER_TOPIC = 3
+
+def build_topics_prompt(title: str, transcript: str) -> str:
+    """Prompt that extracts topics and questions from a whole transcript"""
+    return f"""
+You are an expert content analyzer. Given a YouTube video transcript, identify at most 5 most interesting topics discussed and generate at most 3 most thought-provoking questions for each topic.
+These questions don't need to be directly asked in the video. It's good to have clarification questions.
+
+VIDEO TITLE: {title}
+
+TRANSCRIPT:
+{transcript}
+
+Format your response in YAML:
+
+```yaml
+topics:
+  - title: |
+        First Topic Title
+    questions:
+      - |
+        Question 1 about first topic?
+      - |
+        Question 2 ...
+  - title: |
+        Second Topic Title
+    questions:
+        ...
+```
+        """
+
+def build_content_prompt(topic_title: str, questions: List[str], transcript: str) -> str:
+    """Prompt that rephrases one topic's questions and answers them ELI5-style"""
+    return f"""You are a content simplifier for children. Given a topic and questions from a YouTube video, rephrase the topic title and questions to be clearer, and provide simple ELI5 (Explain Like I'm 5) answers.
+
+TOPIC: {topic_title}
+
+QUESTIONS:
+{chr(10).join([f"- {q}" for q in questions])}
+
+TRANSCRIPT EXCERPT:
+{transcript}
+
+For topic title and questions:
+1. Keep them catchy and interesting, but short
+
+For your answers:
+1. Format them using HTML with <b> and <i> tags for highlighting. 
+2. Prefer lists with <ol> and <li> tags. Ideally, <li> followed by <b> for the key points.
+3. Quote important keywords but explain them in easy-to-understand language (e.g., "<b>Quantum computing</b> is like having a super-fast magical calculator")
+4. Keep answers interesting but short
+
+Format your response in YAML:
+
+```yaml
+rephrased_title: |
+    Interesting topic title in 10 words
+questions:
+  - original: |
+        {questions[0] if len(questions) > 0 else ''}
+    rephrased: |
+        Interesting question in 15 words
+    answer: |
+        Simple answer that a 5-year-old could understand in 100 words
+  - original: |
+        {questions[1] if len(questions) > 1 else ''}
+    ...
+```
+        """
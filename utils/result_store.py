@@ -0,0 +1,108 @@
+from typing import Any, Dict, List
+import gzip
+import json
+import os
+import time
+from utils.source_key import key_slug
+from utils.transcript_segments import attach_segments, detach_segments
+
+# Bump when the record layout changes, and teach _upgrade_record to read
+# the older versions
+FORMAT_VERSION = 2
+RECORD_SUFFIX = ".json.gz"
+SEGMENTS_SUFFIX = ".seg"
+
+def record_path(store_dir: str, source_key: str) -> str:
+    """Where the record for a source key lives in store_dir"""
+    return os.path.join(store_dir, f"{key_slug(source_key)}{RECORD_SUFFIX}")
+
+def segments_path(path: str) -> str:
+    """Where the transcript segments of the record at path live"""
+    return path[:-len(RECORD_SUFFIX)] + SEGMENTS_SUFFIX
+
+def save_record(store_dir: str, source_info: Dict[str, Any], topics: List[Dict[str, Any]]) -> str:
+    """Persist a processed video's source info and topics as versioned, gzipped JSON
+
+    The bytes are deterministic (sorted keys, no gzip timestamp), so saving
+    unchanged results leaves the file's digest unchanged. Transcript segments
+    (which hold the transcript text) go to a .seg file next to the record.
+    """
+    source_key = source_info.get("source_key")
+    if not source_key:
+        raise ValueError("source_info has no source_key")
+
+    data, segments = detach_segments(source_info)
+    record = {
+        "version": FORMAT_VERSION,
+        "source_key": source_key,
+        "source_info": data,
+        "topics": topics
+    }
+    payload = json.dumps(record, sort_keys=True, separators=(",", ":")).encode("utf-8")
+
+    os.makedirs(store_dir, exist_ok=True)
+    path = record_path(store_dir, source_key)
+    if segments is not None:
+        segments.save(segments_path(path))
+    elif os.path.exists(segments_path(path)):
+        os.remove(segments_path(path))
+    tmp_path = f"{path}.{os.getpid()}.{time.monotonic_ns()}.tmp"
+    with open(tmp_path, "wb") as f:
+        with gzip.GzipFile(fileobj=f, mode="wb", mtime=0) as gz:
+            gz.write(payload)
+    os.replace(tmp_path, path)
+    return path
+
+def _upgrade_record(record: Dict[str, Any]) -> Dict[str, Any]:
+    """Bring an older record up to FORMAT_VERSION"""
+    version = record.get("version")
+    if version == 1:
+        # Version 1 kept segment timing as JSON lists or a path into the
+        # source cache; the transcript itself is still there
+        record["source_info"].pop("segments", None)
+        record["source_info"].pop("segments_path", None)
+        record["version"] = version = 2
+    if version != FORMAT_VERSION:
+        raise ValueError(f"Unsupported result record version: {version}")
+    return record
+
+def load_record(path: str) -> Dict[str, Any]:
+    """Load a record saved by save_record, with its segments memory-mapped"""
+    with gzip.open(path, "rb") as f:
+        record = _upgrade_record(json.loads(f.read().decode("utf-8")))
+
+    source_info = record["source_info"]
+    if os.path.exists(segments_path(path)):
+        record["source_info"] = attach_segments(source_info, segments_path(path))
+    elif "transcript" not in source_info:
+        raise ValueError(f"Transcript segments missing for {path}")
+    else:
+        source_info["segments"] = None
+    return record
+
+def list_records(store_dir: str) -> List[str]:
+    """Paths of all records in store_dir, sorted"""
+    if not os.path.isdir(store_dir):
+        return []
+    return sorted(
+        os.path.join(store_dir, name)
+        for name in os.listdir(store_dir)
+        if name.endswith(RECORD_SUFFIX)
+    )
+
+if __name__ == "__main__":
+    import tempfile
+
+    test_source = {
+        "type": "youtube",
+        "title": "Introduction to TensorFlow",
+        "location": "https://www.youtube.com/watch?v=example1234",
+        "source_key": "youtube:example1234",
+        "transcript": "TensorFlow is an open-source machine learning framework. " * 1000
+    }
+    test_topics = [{"title": "Basics", "rephrased_title": "TensorFlow Basics", "questions": []}]
+
+    store_dir = tempfile.mkdtemp()
+    path = save_record(store_dir, test_source, test_topics)
+    print(f"Saved {path} ({os.path.getsize(path)} bytes)")
+    print(f"Round trip ok: {load_record(path)['topics'] == test_topics}")
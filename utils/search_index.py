@@ -0,0 +1,255 @@
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+import hashlib
+import html
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+
+SCHEMA_VERSION = 1
+TRANSCRIPT_CHUNK_CHARS = 1000
+
+# chunks holds the rows, chunks_fts is an external-content FTS5 index over
+# them kept in sync by triggers, so re-indexing a video is a cheap
+# DELETE ... WHERE source_key = ? on an ordinary indexed column
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS videos (
+    source_key TEXT PRIMARY KEY,
+    video_id TEXT,
+    title TEXT,
+    location TEXT,
+    digest TEXT NOT NULL,
+    indexed_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS chunks (
+    id INTEGER PRIMARY KEY,
+    source_key TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    start REAL,
+    title TEXT,
+    body TEXT
+);
+CREATE INDEX IF NOT EXISTS chunks_source_key ON chunks(source_key);
+CREATE VIRTUAL TABLE IF NOT EXISTS chunks_fts USING fts5(
+    title, body, content='chunks', content_rowid='id', tokenize='porter unicode61'
+);
+CREATE TRIGGER IF NOT EXISTS chunks_ai AFTER INSERT ON chunks BEGIN
+    INSERT INTO chunks_fts(rowid, title, body) VALUES (new.id, new.title, new.body);
+END;
+CREATE TRIGGER IF NOT EXISTS chunks_ad AFTER DELETE ON chunks BEGIN
+    INSERT INTO chunks_fts(chunks_fts, rowid, title, body) VALUES ('delete', old.id, old.title, old.body);
+END;
+"""
+
+_TAG_PATTERN = re.compile(r'<[^>]+>')
+
+def strip_html(text: str) -> str:
+    """Plain text of an LLM answer, which is formatted with HTML tags"""
+    return html.unescape(_TAG_PATTERN.sub(" ", text or ""))
+
+def chunk_transcript(source_info: Dict[str, Any], size: int = TRANSCRIPT_CHUNK_CHARS) -> Iterable[Tuple[Optional[float], str]]:
+    """Split a transcript into (start seconds, text) chunks of about size chars
+
+    With segment timing the chunks follow segment boundaries and carry the
+    start time of their first segment. A flat transcript has no timing
+    information, so it is split at spaces and start is None.
+    """
+    segments = source_info.get("segments")
+    if segments is not None:
+        for i, j in segments.windows(size):
+            yield segments.starts[i], segments.text_of(i, j)
+        return
+
+    transcript = source_info.get("transcript", "")
+    pos = 0
+    while pos < len(transcript):
+        end = min(len(transcript), pos + size)
+        if end < len(transcript):
+            # Break at the last space so words are not cut in half
+            space = transcript.rfind(" ", pos, end)
+            if space > pos:
+                end = space
+        yield None, transcript[pos:end].strip()
+        pos = end
+
+def video_digest(source_info: Dict[str, Any], topics: List[Dict[str, Any]]) -> str:
+    """Digest of everything that is indexed for a video
+
+    Only indexed fields count, so processing the same video from another
+    path or cache directory doesn't rewrite its rows.
+    """
+    indexed = [source_info.get("title"), source_info.get("video_id"), topics]
+    digest = hashlib.sha256(json.dumps(indexed, sort_keys=True).encode("utf-8"))
+    digest.update(source_info.get("transcript", "").encode("utf-8"))
+    # Chunk start times come from the segment timing
+    segments = source_info.get("segments")
+    if segments is not None:
+        digest.update(bytes(segments.starts))
+    return digest.hexdigest()
+
+def build_chunks(source_info: Dict[str, Any], topics: List[Dict[str, Any]]) -> Iterable[Tuple[str, Optional[float], str, str]]:
+    """(kind, start, title, body) rows for a video's topics, Q&As and transcript"""
+    for topic in topics:
+        topic_title = topic.get("rephrased_title") or topic.get("title", "")
+        yield "topic", None, topic_title, topic.get("title", "")
+        for q in topic.get("questions", []):
+            question = q.get("rephrased") or q.get("original", "")
+            yield "question", None, topic_title, question
+            if q.get("answer"):
+                yield "answer", None, question, strip_html(q["answer"])
+    for start, text in chunk_transcript(source_info):
+        yield "transcript", start, source_info.get("title", ""), text
+
+def fts_query(query: str) -> str:
+    """Quote each term so user input can't trip FTS5 query syntax"""
+    terms = query.split()
+    return " ".join('"' + term.replace('"', '""') + '"' for term in terms)
+
+def timestamp_url(video_id: Optional[str], location: Optional[str], start: Optional[float]) -> Optional[str]:
+    """Link to the hit, jumping to start seconds on YouTube when known"""
+    if video_id:
+        url = f"https://www.youtube.com/watch?v={video_id}"
+        return f"{url}&t={int(start)}s" if start is not None else url
+    return location
+
+class SearchIndex:
+    """On-disk full-text index over all processed videos (SQLite FTS5)
+
+    index_video() only rewrites a video's rows when its content digest
+    changed, so updating after each run is incremental.
+    """
+    def __init__(self, path: str):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        with self._conn:
+            self._conn.executescript(SCHEMA)
+            self._conn.execute(f"PRAGMA user_version={SCHEMA_VERSION}")
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def index_video(self, source_info: Dict[str, Any], topics: List[Dict[str, Any]]) -> bool:
+        """Add or refresh a video; returns False if it was already up to date"""
+        source_key = source_info.get("source_key") or source_info.get("location")
+        if not source_key:
+            raise ValueError("source_info has no source_key or location")
+        digest = video_digest(source_info, topics)
+
+        with self._lock, self._conn:
+            row = self._conn.execute("SELECT digest FROM videos WHERE source_key = ?", (source_key,)).fetchone()
+            if row and row[0] == digest:
+                return False
+
+            self._conn.execute("DELETE FROM chunks WHERE source_key = ?", (source_key,))
+            self._conn.executemany(
+                "INSERT INTO chunks (source_key, kind, start, title, body) VALUES (?, ?, ?, ?, ?)",
+                ((source_key, kind, start, title, body) for kind, start, title, body in build_chunks(source_info, topics))
+            )
+            self._conn.execute(
+                "INSERT OR REPLACE INTO videos (source_key, video_id, title, location, digest, indexed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (source_key, source_info.get("video_id"), source_info.get("title"),
+                 source_info.get("location"), digest, time.time())
+            )
+        return True
+
+    def remove_video(self, source_key: str):
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM chunks WHERE source_key = ?", (source_key,))
+            self._conn.execute("DELETE FROM videos WHERE source_key = ?", (source_key,))
+
+    def search(self, query: str, limit: int = 10, kind: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Ranked hits for query, best first (BM25, title matches weighted higher)"""
+        match = fts_query(query)
+        if not match:
+            return []
+        sql = """
+            SELECT c.source_key, v.video_id, v.title, v.location, c.kind, c.start, c.title,
+                   snippet(chunks_fts, 1, '[', ']', '...', 16), bm25(chunks_fts, 2.0, 1.0) AS score
+            FROM chunks_fts
+            JOIN chunks c ON c.id = chunks_fts.rowid
+            JOIN videos v ON v.source_key = c.source_key
+            WHERE chunks_fts MATCH ?
+        """
+        params: List[Any] = [match]
+        if kind:
+            sql += " AND c.kind = ?"
+            params.append(kind)
+        sql += " ORDER BY score LIMIT ?"
+        params.append(limit)
+
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        return [
+            {
+                "source_key": source_key,
+                "video_id": video_id,
+                "video_title": video_title,
+                "kind": kind,
+                "start": start,
+                "title": title,
+                "snippet": snippet,
+                "score": score,
+                "url": timestamp_url(video_id, location, start)
+            }
+            for source_key, video_id, video_title, location, kind, start, title, snippet, score in rows
+        ]
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            videos = self._conn.execute("SELECT COUNT(*) FROM videos").fetchone()[0]
+            chunks = self._conn.execute("SELECT COUNT(*) FROM chunks").fetchone()[0]
+        return {"videos": videos, "chunks": chunks}
+
+# One SearchIndex per database file, shared by concurrent flow runs
+_search_indexes: Dict[str, SearchIndex] = {}
+_search_indexes_lock = threading.Lock()
+
+def get_search_index(path: str) -> SearchIndex:
+    """Return the process-wide SearchIndex for path"""
+    with _search_indexes_lock:
+        key = os.path.realpath(path)
+        if key not in _search_indexes:
+            _search_indexes[key] = SearchIndex(path)
+        return _search_indexes[key]
+
+
+def main():
+    """Query the search index from the command line"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Search topics, questions, answers and transcripts of processed videos')
+    parser.add_argument('query', help='Words to search for')
+    parser.add_argument('--db', default='search_index.db', help='Path to the search index database')
+    parser.add_argument('--limit', type=int, default=10, help='Maximum number of hits')
+    parser.add_argument('--kind', choices=['topic', 'question', 'answer', 'transcript'], help='Only return hits of this kind')
+    args = parser.parse_args()
+
+    if not os.path.exists(args.db):
+        print(f"Search index not found: {args.db}")
+        return
+
+    index = SearchIndex(args.db)
+    start = time.perf_counter()
+    hits = index.search(args.query, limit=args.limit, kind=args.kind)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+
+    for i, hit in enumerate(hits, 1):
+        print(f"{i}. {hit['video_title']} [{hit['kind']}]")
+        print(f"   {hit['snippet']}")
+        if hit["url"]:
+            print(f"   {hit['url']}")
+    print(f"\n{len(hits)} hits in {elapsed_ms:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+from typing import Any, Callable, Dict, Hashable
+import threading
+
+class _Call:
+    """A single in-flight computation and its outcome"""
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+class SingleFlight:
+    """Coalesce concurrent calls that share a key into one execution
+
+    The first caller for a key runs the function. Callers that arrive while it
+    is still running wait for it and get the same result (or exception). Once
+    the call finishes the key is forgotten, so later calls run it again.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call] = {}
+
+    def do(self, key: Hashable, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """Run fn(*args, **kwargs) unless a call for key is already in flight"""
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn(*args, **kwargs)
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result
+
+    def in_flight(self, key: Hashable) -> bool:
+        """Whether a call for key is currently running"""
+        with self._lock:
+            return key in self._calls
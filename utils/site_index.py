@@ -0,0 +1,203 @@
+from typing import Any, Dict, List, TextIO
+import hashlib
+import html
+import json
+import os
+import re
+import threading
+from functools import lru_cache
+from utils import html_generator
+from utils.html_generator import write_head, write_report, write_stylesheet, STYLESHEET_NAME
+from utils.source_key import key_slug
+
+MANIFEST_NAME = "index.json"
+INDEX_NAME = "index.html"
+MANIFEST_VERSION = 1
+
+@lru_cache(maxsize=1)
+def template_hash() -> str:
+    """Hash of the HTML templates (report pages in html_generator, index
+    entries in this module), so a template change re-renders every report"""
+    digest = hashlib.sha256()
+    for path in (html_generator.__file__, __file__):
+        with open(path, "rb") as f:
+            digest.update(f.read())
+    return digest.hexdigest()
+
+def report_slug(source_info: Dict[str, Any]) -> str:
+    """File name (without .html) for a source's report"""
+    if source_info.get("source_key"):
+        return key_slug(source_info["source_key"])
+    return re.sub(r'[^A-Za-z0-9._-]+', '_', source_info.get("title", "")).strip("_") or "report"
+
+# Bulky source_info fields that reports never show
+UNSHOWN_FIELDS = ("transcript", "segments")
+
+def report_digest(source_info: Dict[str, Any], topics: List[Dict[str, Any]]) -> str:
+    """Digest of everything a report is rendered from (the transcript is not shown)"""
+    shown = {key: value for key, value in source_info.items() if key not in UNSHOWN_FIELDS}
+    payload = json.dumps([template_hash(), shown, topics], sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+def render_entry(href: str, source_info: Dict[str, Any], topics: List[Dict[str, Any]]) -> str:
+    """Index page list item for one report"""
+    title = html.escape(source_info.get("title", ""))
+    thumbnail = source_info.get("thumbnail_url")
+    image = (
+        f'\n          <img src="{html.escape(thumbnail)}" alt="" loading="lazy" class="w-32 rounded-lg mr-4" />'
+        if thumbnail else ""
+    )
+    return f"""
+      <li>
+        <a href="{html.escape(href)}" class="flex items-center hover:text-gray-800">{image}
+          <span><strong>{title}</strong><br />{len(topics)} topics</span>
+        </a>
+      </li>"""
+
+class SiteIndex:
+    """Static site of HTML reports with an incrementally maintained index page
+
+    index.json keeps, per report, the digest of its inputs and its rendered
+    index entry. Publishing an unchanged report is a no-op, and rebuilding
+    index.html only streams the cached entries, so it stays cheap with
+    thousands of reports.
+    """
+    def __init__(self, site_dir: str):
+        self.site_dir = site_dir
+        self._lock = threading.RLock()
+        self._entries = self._load_manifest()
+        self._dirty = False
+        self._stylesheet_written = False
+
+    def _load_manifest(self) -> Dict[str, Dict[str, Any]]:
+        path = os.path.join(self.site_dir, MANIFEST_NAME)
+        if not os.path.exists(path):
+            return {}
+        with open(path, encoding="utf-8") as f:
+            manifest = json.load(f)
+        if manifest.get("version") != MANIFEST_VERSION:
+            return {}
+        return manifest.get("entries", {})
+
+    def is_current(self, source_info: Dict[str, Any], topics: List[Dict[str, Any]]) -> bool:
+        """Whether the published report for this source was rendered from the same inputs"""
+        slug = report_slug(source_info)
+        with self._lock:
+            entry = self._entries.get(slug)
+        return bool(entry) and entry["digest"] == report_digest(source_info, topics) \
+            and os.path.exists(os.path.join(self.site_dir, f"{slug}.html"))
+
+    def add_entry(self, source_info: Dict[str, Any], topics: List[Dict[str, Any]]):
+        """Record a report that has been written to <site_dir>/<slug>.html
+
+        Used directly when reports are rendered elsewhere (e.g. in worker
+        processes); call flush() afterwards.
+        """
+        slug = report_slug(source_info)
+        entry = {
+            "title": source_info.get("title", ""),
+            "digest": report_digest(source_info, topics),
+            "fragment": render_entry(f"{slug}.html", source_info, topics)
+        }
+        with self._lock:
+            self._entries[slug] = entry
+            self._dirty = True
+
+    def ensure_stylesheet(self):
+        with self._lock:
+            if not self._stylesheet_written:
+                write_stylesheet(self.site_dir)
+                self._stylesheet_written = True
+
+    def publish(self, source_info: Dict[str, Any], topics: List[Dict[str, Any]], write_index: bool = True) -> str:
+        """Write a source's report if its inputs changed and update its index entry
+
+        Pass write_index=False when publishing many reports and call flush()
+        once at the end.
+        """
+        path = os.path.join(self.site_dir, f"{report_slug(source_info)}.html")
+        if self.is_current(source_info, topics):
+            return path
+
+        self.ensure_stylesheet()
+        write_report(path, source_info, topics, stylesheet_href=STYLESHEET_NAME)
+        self.add_entry(source_info, topics)
+        if write_index:
+            self.flush()
+        return path
+
+    def remove(self, slug: str, write_index: bool = True):
+        """Drop a report and its index entry"""
+        with self._lock:
+            if self._entries.pop(slug, None) is None:
+                return
+            self._dirty = True
+        path = os.path.join(self.site_dir, f"{slug}.html")
+        if os.path.exists(path):
+            os.remove(path)
+        if write_index:
+            self.flush()
+
+    def flush(self):
+        """Write index.json and index.html if any entry changed since the last flush"""
+        with self._lock:
+            if not self._dirty:
+                return
+            os.makedirs(self.site_dir, exist_ok=True)
+            self._write_atomic(MANIFEST_NAME, lambda f: json.dump(
+                {"version": MANIFEST_VERSION, "entries": self._entries}, f
+            ))
+            self._write_atomic(INDEX_NAME, self._write_index)
+            self._dirty = False
+
+    def _write_atomic(self, name: str, write):
+        path = os.path.join(self.site_dir, name)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            write(f)
+        os.replace(tmp_path, path)
+
+    def _write_index(self, out: TextIO):
+        write_head(out, "Youtube Made Simple", STYLESHEET_NAME)
+        out.write(f"""<body class="min-h-screen flex justify-center p-4">
+  <div class="max-w-2xl w-full bg-white rounded-2xl shadow-lg p-6">
+    <h1 class="text-4xl text-gray-800 mb-4">Youtube Made Simple</h1>
+    <p class="text-gray-500 mb-6">{len(self._entries)} videos</p>
+    <ul class="text-gray-600">""")
+        for _, entry in sorted(self._entries.items(), key=lambda item: (item[1]["title"].lower(), item[0])):
+            out.write(entry["fragment"])
+        out.write("""
+    </ul>
+  </div>
+</body>
+</html>""")
+
+# One SiteIndex per directory, shared by concurrent flow runs
+_site_indexes: Dict[str, SiteIndex] = {}
+_site_indexes_lock = threading.Lock()
+
+def get_site_index(site_dir: str) -> SiteIndex:
+    """Return the process-wide SiteIndex for site_dir"""
+    with _site_indexes_lock:
+        key = os.path.realpath(site_dir)
+        if key not in _site_indexes:
+            _site_indexes[key] = SiteIndex(site_dir)
+        return _site_indexes[key]
+
+if __name__ == "__main__":
+    import tempfile
+
+    test_source = {
+        "title": "Introduction to <TensorFlow>",
+        "source_key": "youtube:example1234",
+        "thumbnail_url": "https://img.youtube.com/vi/example1234/maxresdefault.jpg"
+    }
+    test_topics = [{
+        "title": "Basics",
+        "rephrased_title": "TensorFlow Basics",
+        "questions": [{"original": "What?", "rephrased": "What is TensorFlow?", "answer": "A <b>framework</b>."}]
+    }]
+    site_dir = tempfile.mkdtemp()
+    site = SiteIndex(site_dir)
+    print(f"Published: {site.publish(test_source, test_topics)}")
+    print(f"Files: {sorted(os.listdir(site_dir))}")
@@ -0,0 +1,66 @@
+from typing import Dict
+import hashlib
+import os
+import threading
+from utils.youtube_processor import extract_video_id, canonical_video_url
+
+# (realpath, size, mtime_ns) -> sha256, so the same file is only hashed once
+_hash_cache: Dict[tuple, str] = {}
+_hash_cache_lock = threading.Lock()
+
+def file_content_hash(file_path: str, chunk_size: int = 1 << 20) -> str:
+    """SHA-256 of a file's contents, read in chunks and cached per file version"""
+    stat = os.stat(file_path)
+    cache_key = (os.path.realpath(file_path), stat.st_size, stat.st_mtime_ns)
+    with _hash_cache_lock:
+        cached = _hash_cache.get(cache_key)
+    if cached:
+        return cached
+
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    content_hash = digest.hexdigest()
+
+    with _hash_cache_lock:
+        _hash_cache[cache_key] = content_hash
+    return content_hash
+
+def canonical_source(source: str) -> Dict[str, str]:
+    """Map any form of a source to its type, stable key and canonical location
+
+    YouTube URLs in any form (youtu.be, watch?v=...&t=30, shorts, embed) map to
+    "youtube:<video_id>"; local files map to "file:<sha256 of contents>" so
+    copies and renames of the same file share a key.
+    """
+    source = source.strip()
+    is_url = source.startswith(("http://", "https://"))
+    if is_url or not os.path.exists(source):
+        video_id = extract_video_id(source)
+        if video_id:
+            return {
+                "type": "youtube",
+                "key": f"youtube:{video_id}",
+                "location": canonical_video_url(video_id)
+            }
+        if is_url:
+            raise ValueError(f"Invalid YouTube URL: {source}")
+        raise FileNotFoundError(f"Video file not found: {source}")
+
+    return {
+        "type": "local",
+        "key": f"file:{file_content_hash(source)}",
+        "location": source
+    }
+
+def canonical_source_key(source: str) -> str:
+    """Stable key for a source: the YouTube video ID or the file content hash"""
+    return canonical_source(source)["key"]
+
+def key_slug(key: str) -> str:
+    """Filesystem-safe short name for a source key, e.g. youtube_<id> or file_<hash16>"""
+    kind, _, value = key.partition(":")
+    if kind == "file":
+        value = value[:16]
+    return f"{kind}_{value}"
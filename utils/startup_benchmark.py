@@ -0,0 +1,99 @@
+from typing import Dict, List, Tuple
+import os
+import subprocess
+import sys
+import time
+import statistics
+
+# Modules that must never be loaded just to start the CLI
+HEAVY_MODULES = ("anthropic", "bs4", "requests", "youtube_transcript_api", "pocketflow", "yaml")
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def parse_importtime(stderr: str) -> Dict[str, Tuple[int, int]]:
+    """Parse `python -X importtime` output into {module: (self_us, cumulative_us)}"""
+    modules = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        try:
+            self_us, cumulative_us, name = line[len("import time:"):].split("|")
+            modules[name.strip()] = (int(self_us), int(cumulative_us))
+        except ValueError:
+            continue
+    return modules
+
+
+def measure_imports(target: str = "import main") -> Dict[str, Tuple[int, int]]:
+    """Run the target statement under -X importtime in a fresh interpreter"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", target],
+        cwd=PROJECT_ROOT,
+        capture_output=True,
+        text=True,
+        check=True
+    )
+    return parse_importtime(result.stderr)
+
+
+def measure_startup(argv: List[str], runs: int = 5) -> List[float]:
+    """Wall-clock time in milliseconds of `python <argv>` for each run"""
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(
+            [sys.executable] + argv,
+            cwd=PROJECT_ROOT,
+            capture_output=True,
+            check=True
+        )
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def main():
+    """Check cold-start time of the CLI against a budget (for CI)"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Benchmark CLI cold start and check it against a time budget')
+    parser.add_argument('--budget-ms', type=float, default=float(os.getenv("STARTUP_BUDGET_MS", "300")),
+                        help='Maximum median wall time of `main.py --help` in milliseconds')
+    parser.add_argument('--runs', type=int, default=5, help='Number of cold starts to time')
+    parser.add_argument('--top', type=int, default=10, help='Number of slowest imports to print')
+    args = parser.parse_args()
+
+    failed = False
+
+    modules = measure_imports("import main")
+    loaded_heavy = sorted({
+        name.split(".")[0] for name in modules
+        if name.split(".")[0] in HEAVY_MODULES
+    })
+    slowest = sorted(modules.items(), key=lambda item: item[1][1], reverse=True)[:args.top]
+
+    print("Slowest imports for `import main` (cumulative us):")
+    for name, (self_us, cumulative_us) in slowest:
+        print(f"  {cumulative_us:>8}  {name}")
+
+    if loaded_heavy:
+        failed = True
+        print(f"✗ Heavy modules imported at startup: {', '.join(loaded_heavy)}")
+    else:
+        print("✓ No heavy modules imported at startup")
+
+    timings = measure_startup(["main.py", "--help"], runs=args.runs)
+    median = statistics.median(timings)
+    print(f"`main.py --help`: median {median:.1f} ms, min {min(timings):.1f} ms over {args.runs} runs "
+          f"(budget {args.budget_ms:.0f} ms)")
+    if median > args.budget_ms:
+        failed = True
+        print("✗ Startup time over budget")
+    else:
+        print("✓ Startup time within budget")
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,226 @@
+from typing import Any, Dict, Iterable, Iterator, Optional, Tuple
+from array import array
+from bisect import bisect_left, bisect_right
+import mmap
+import os
+import struct
+import sys
+
+# On-disk layout: header, then byte offsets (int64 * n+1), char offsets
+# (int64 * n+1), starts (float64 * n), durations (float64 * n) and the UTF-8
+# text. Everything is little-endian and 8-byte aligned, so open() can cast
+# the mapped file straight into arrays without copying.
+MAGIC = b"YMSSEG01"
+HEADER = struct.Struct("<8sQQ")
+
+def _field(entry: Any, name: str, default: Any = None) -> Any:
+    """Read a field from a transcript entry dict or snippet object"""
+    if isinstance(entry, dict):
+        return entry.get(name, default)
+    return getattr(entry, name, default)
+
+class TranscriptSegments:
+    """Timestamped transcript segments stored as compact arrays over one text buffer
+
+    The text is every segment joined by a single space (the same string the
+    flow has always used as the transcript), held once as UTF-8 bytes.
+    Segment i starts at byte_offsets[i] / char_offsets[i]; both offset arrays
+    have a trailing sentinel so segment i ends one separator before offset
+    i + 1. Lookups by time or offset are binary searches and slices are
+    memoryviews into the buffer.
+    """
+    def __init__(self, buffer, byte_offsets, char_offsets, starts, durations, mapping=None):
+        self.buffer = memoryview(buffer)
+        self.byte_offsets = byte_offsets
+        self.char_offsets = char_offsets
+        self.starts = starts
+        self.durations = durations
+        self._mapping = mapping
+        self._text = None
+
+    @classmethod
+    def from_entries(cls, entries: Iterable[Any]) -> "TranscriptSegments":
+        """Build from YouTubeTranscriptApi entries (text, start, duration) or
+        Whisper segments (text, start, end)"""
+        parts = []
+        byte_offsets, char_offsets = array("q"), array("q")
+        starts, durations = array("d"), array("d")
+        byte_pos = char_pos = 0
+        for entry in entries:
+            text = _field(entry, "text", "")
+            start = float(_field(entry, "start", 0.0))
+            duration = _field(entry, "duration")
+            if duration is None:
+                duration = float(_field(entry, "end", start)) - start
+
+            encoded = text.encode("utf-8")
+            byte_offsets.append(byte_pos)
+            char_offsets.append(char_pos)
+            starts.append(start)
+            durations.append(float(duration))
+            parts.append(encoded)
+            byte_pos += len(encoded) + 1
+            char_pos += len(text) + 1
+        byte_offsets.append(byte_pos)
+        char_offsets.append(char_pos)
+        return cls(b" ".join(parts), byte_offsets, char_offsets, starts, durations)
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    @property
+    def text(self) -> str:
+        """The whole transcript as a str (decoded once, on first use)"""
+        if self._text is None:
+            self._text = str(self.buffer, "utf-8")
+        return self._text
+
+    @property
+    def duration(self) -> float:
+        """End time of the last segment in seconds"""
+        if not len(self):
+            return 0.0
+        return self.starts[-1] + self.durations[-1]
+
+    def _clamp(self, index: int) -> int:
+        if not len(self):
+            raise IndexError("transcript has no segments")
+        return min(max(index, 0), len(self) - 1)
+
+    def segment_at_time(self, seconds: float) -> int:
+        """Index of the segment playing at seconds (or the nearest one)"""
+        return self._clamp(bisect_right(self.starts, seconds) - 1)
+
+    def segment_at_char(self, offset: int) -> int:
+        """Index of the segment containing character offset in text"""
+        return self._clamp(bisect_right(self.char_offsets, offset, 0, len(self)) - 1)
+
+    def segment_at_byte(self, offset: int) -> int:
+        """Index of the segment containing byte offset in buffer"""
+        return self._clamp(bisect_right(self.byte_offsets, offset, 0, len(self)) - 1)
+
+    def time_window(self, start_seconds: float, end_seconds: float) -> Tuple[int, int]:
+        """Segment range [i, j) overlapping start_seconds..end_seconds"""
+        i = self.segment_at_time(start_seconds)
+        j = bisect_left(self.starts, end_seconds, i, len(self))
+        return i, max(j, i + 1)
+
+    def char_span(self, i: int, j: int) -> Tuple[int, int]:
+        """Character span of segments [i, j) in text"""
+        return self.char_offsets[i], self.char_offsets[j] - 1
+
+    def slice(self, i: int, j: int) -> memoryview:
+        """UTF-8 bytes of segments [i, j), without copying"""
+        return self.buffer[self.byte_offsets[i]:self.byte_offsets[j] - 1]
+
+    def text_of(self, i: int, j: int) -> str:
+        """Text of segments [i, j)"""
+        return str(self.slice(i, j), "utf-8")
+
+    def windows(self, max_chars: int) -> Iterator[Tuple[int, int]]:
+        """Consecutive segment ranges [i, j) of at most max_chars characters each
+
+        A single segment longer than max_chars becomes its own window.
+        """
+        n = len(self)
+        i = 0
+        while i < n:
+            limit = self.char_offsets[i] + max_chars + 1
+            j = bisect_right(self.char_offsets, limit, i + 1, n + 1) - 1
+            j = max(j, i + 1)
+            yield i, j
+            i = j
+
+    def save(self, path: str):
+        """Write the binary form that open() memory-maps
+
+        The file is replaced atomically, so readers that have the previous
+        version mapped keep a consistent view.
+        """
+        arrays = [array("q", self.byte_offsets), array("q", self.char_offsets),
+                  array("d", self.starts), array("d", self.durations)]
+        if sys.byteorder != "little":
+            for a in arrays:
+                a.byteswap()
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(HEADER.pack(MAGIC, len(self), len(self.buffer)))
+            for a in arrays:
+                f.write(a)
+            f.write(self.buffer)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def open(cls, path: str) -> "TranscriptSegments":
+        """Memory-map a file written by save(); arrays and text are not copied"""
+        with open(path, "rb") as f:
+            mapping = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, n, text_len = HEADER.unpack_from(mapping)
+        if magic != MAGIC:
+            mapping.close()
+            raise ValueError(f"Not a transcript segment file: {path}")
+
+        view = memoryview(mapping)
+        pos = HEADER.size
+        parts = []
+        for typecode, count in (("q", n + 1), ("q", n + 1), ("d", n), ("d", n)):
+            part = view[pos:pos + 8 * count].cast(typecode)
+            if sys.byteorder != "little":
+                part = array(typecode, part)
+                part.byteswap()
+            parts.append(part)
+            pos += 8 * count
+        buffer = view[pos:pos + text_len]
+        return cls(buffer, *parts, mapping=mapping)
+
+    def close(self):
+        """Release a memory-mapped file opened with open()"""
+        if self._mapping is None:
+            return
+        for name in ("buffer", "byte_offsets", "char_offsets", "starts", "durations"):
+            value = getattr(self, name)
+            if isinstance(value, memoryview):
+                value.release()
+        self._mapping.close()
+        self._mapping = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+def detach_segments(source_info: Dict[str, Any]) -> Tuple[Dict[str, Any], Optional[TranscriptSegments]]:
+    """Split source_info into JSON-friendly fields and its segments
+
+    With segments the transcript is left out too: it is the segments' text,
+    which the .seg file written by save() already holds.
+    """
+    segments = source_info.get("segments")
+    dropped = ("segments", "transcript") if segments is not None else ("segments",)
+    return {key: value for key, value in source_info.items() if key not in dropped}, segments
+
+def attach_segments(data: Dict[str, Any], path: str) -> Dict[str, Any]:
+    """Inverse of detach_segments: memory-map path and restore segments and transcript"""
+    segments = TranscriptSegments.open(path)
+    return dict(data, transcript=segments.text, segments=segments)
+
+if __name__ == "__main__":
+    import tempfile
+
+    test_entries = [
+        {"text": "Hello and welcome", "start": 0.0, "duration": 2.5},
+        {"text": "today we talk about AI", "start": 2.5, "duration": 3.0},
+        {"text": "and what it means for você", "start": 5.5, "duration": 4.0},
+    ]
+    segments = TranscriptSegments.from_entries(test_entries)
+    print(f"Text: {segments.text!r}")
+    print(f"Segment at 3.0s: {segments.segment_at_time(3.0)}")
+    print(f"Segment at char 20: {segments.segment_at_char(20)}")
+    print(f"Window 3s..5s: {segments.text_of(*segments.time_window(3.0, 5.0))!r}")
+    print(f"Windows of 30 chars: {list(segments.windows(30))}")
+
+    path = os.path.join(tempfile.mkdtemp(), "transcript.seg")
+    segments.save(path)
+    with TranscriptSegments.open(path) as mapped:
+        print(f"Memory-mapped round trip ok: {mapped.text == segments.text and mapped.segment_at_time(6.0) == 2}")
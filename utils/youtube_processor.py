@@ -1,13 +1,38 @@
 import re
-import requests
-from bs4 import BeautifulSoup
-from youtube_transcript_api import YouTubeTranscriptApi
+from urllib.parse import urlparse, parse_qs
+
+VIDEO_ID_PATTERN = re.compile(r'^[0-9A-Za-z_-]{11}$')
+
+# Path prefixes that are followed directly by the video ID on youtube.com
+_ID_PATH_PREFIXES = ("embed", "shorts", "live", "v", "e")
 
 def extract_video_id(url):
-    """Extract YouTube video ID from URL"""
-    pattern = r'(?:v=|\/)([0-9A-Za-z_-]{11})'
-    match = re.search(pattern, url)
-    return match.group(1) if match else None
+    """Extract YouTube video ID from URL
+
+    Handles watch?v=, youtu.be/, /embed/, /shorts/, /live/ and /v/ forms on any
+    youtube.com subdomain, with or without a scheme and extra query parameters
+    such as &t=30 or &list=...
+    """
+    url = url.strip()
+    parsed = urlparse(url if "://" in url else f"https://{url}")
+    host = (parsed.hostname or "").lower()
+    path_parts = [part for part in parsed.path.split("/") if part]
+
+    candidate = None
+    if host == "youtu.be":
+        candidate = path_parts[0] if path_parts else None
+    elif host in ("youtube.com", "youtube-nocookie.com") or host.endswith((".youtube.com", ".youtube-nocookie.com")):
+        query_ids = parse_qs(parsed.query).get("v")
+        if query_ids:
+            candidate = query_ids[0]
+        elif len(path_parts) >= 2 and path_parts[0] in _ID_PATH_PREFIXES:
+            candidate = path_parts[1]
+
+    return candidate if candidate and VIDEO_ID_PATTERN.match(candidate) else None
+
+def canonical_video_url(video_id):
+    """Return the single canonical watch URL for a video ID"""
+    return f"https://www.youtube.com/watch?v={video_id}"
 
 def get_video_info(url):
     """Get video title, transcript and thumbnail"""
@@ -15,6 +40,12 @@ def get_video_info(url):
     if not video_id:
         return {"error": "Invalid YouTube URL"}
     
+    # Imported here so callers that only need extract_video_id stay light
+    import requests
+    from bs4 import BeautifulSoup
+    from youtube_transcript_api import YouTubeTranscriptApi
+    from utils.transcript_segments import TranscriptSegments
+
     try:
         # Get title using BeautifulSoup
         response = requests.get(url)
@@ -25,13 +56,15 @@ def get_video_info(url):
         # Get thumbnail
         thumbnail_url = f"https://img.youtube.com/vi/{video_id}/maxresdefault.jpg"
         
-        # Get transcript
+        # Get transcript, keeping each entry's start time and duration
         transcript_list = YouTubeTranscriptApi.get_transcript(video_id)
-        transcript = " ".join([entry["text"] for entry in transcript_list])
+        segments = TranscriptSegments.from_entries(transcript_list)
         
         return {
             "title": title,
-            "transcript": transcript,
+            "transcript": segments.text,
+            "segments": segments,
+            "duration": segments.duration,
             "thumbnail_url": thumbnail_url,
             "video_id": video_id
         }
@@ -42,6 +75,7 @@ if __name__ == "__main__":
     test_urls = [
         "https://www.youtube.com/watch?v=_1f-o0nqpEI&t",  # Valid URL
         "https://youtu.be/_1f-o0nqpEI",                   # Short URL
+        "youtube.com/shorts/_1f-o0nqpEI?feature=share",   # Shorts URL without scheme
         "https://invalid-url.com/watch?v=123"             # Invalid URL
     ]
     
@@ -58,6 +92,7 @@ if __name__ == "__main__":
             print(f"Title: {result['title']}")
             print(f"Video ID: {result['video_id']}")
             print(f"Transcript preview: {result['transcript'][:100]}...")
+            print(f"Segments: {len(result['segments'])}, duration: {result['duration']:.0f}s")
             print(f"Thumbnail URL: {result['thumbnail_url']}")
         except Exception as e:
             print(f"✗ Error: {str(e)}")